@@ -0,0 +1,24 @@
+import importlib
+
+from engine.config import STATIC_DIR
+
+# OpenCV and numpy are only imported once one of these is first used,
+# so importing the package stays cheap for the server and the UI
+_LAZY_EXPORTS = {
+    "INPUT_SIZE": "engine.stages",
+    "STAGE_REGISTRY": "engine.stages",
+    "register_stage": "engine.stages",
+    "Stage": "engine.stages",
+    "Pipeline": "engine.pipeline",
+    "setup_pipeline_from_json": "engine.pipeline",
+}
+
+__all__ = ["STATIC_DIR", *_LAZY_EXPORTS]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
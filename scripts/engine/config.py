@@ -0,0 +1,4 @@
+import os
+
+# Directory the stages read their input from and write previews/output to
+STATIC_DIR = os.environ.get("PIPELINE_STATIC_DIR", "./static")
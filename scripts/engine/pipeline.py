@@ -0,0 +1,92 @@
+import numpy as np
+
+from engine.stages import INPUT_SIZE, STAGE_REGISTRY
+
+
+class Pipeline:
+    def __init__(self, input):
+        self.stages = {}
+        self.input = input
+
+    def add_stage(self, stage):
+        self.stages[stage.ID] = stage
+
+    def connect_stages(self, from_stage_id, from_port, to_stage_id, to_port):
+        from_stage = self.stages[from_stage_id]
+        to_stage = self.stages[to_stage_id]
+        from_stage.add_output(to_stage, from_port)
+        to_stage.add_input(from_stage, to_port)
+
+    def run(self, data=None):
+        if data is None:
+            data = self.input
+        return self.stages["Output-1"].run(data)
+
+    def warm_up(self, frame=None):
+        # Run the graph once on a dummy frame so OpenCV's lazy initialization
+        # is paid at startup instead of by the first real request
+        if frame is None:
+            frame = np.zeros((INPUT_SIZE[1], INPUT_SIZE[0], 3), dtype=np.uint8)
+        write_images = {ID: stage.write_images for ID, stage in self.stages.items()}
+        for stage in self.stages.values():
+            stage.write_images = False
+        try:
+            return self.run(frame)
+        finally:
+            for ID, stage in self.stages.items():
+                stage.write_images = write_images[ID]
+
+
+def setup_pipeline_from_json(json_data, pipeline=None):
+    # Stages from a previous pipeline are reused so their prepared resources survive.
+    # The previous pipeline is left untouched until the new graph has been checked.
+    previous = dict(pipeline.stages) if pipeline else {}
+    output = None
+    pipeline = Pipeline(output)
+
+    # First pass: Pick a stage for every node, reusing a previous one of the same type
+    reused = {}
+    for item in json_data:
+        stage_class = STAGE_REGISTRY.get(item["stage_name"])
+
+        if stage_class:
+            stage = previous.get(item["ID"])
+            if type(stage) is stage_class:
+                reused[item["ID"]] = item["options"]
+            else:
+                stage = stage_class(item["stage_name"], item["ID"], item["options"])
+            pipeline.add_stage(stage)
+
+    # Second pass: Collect connections, failing before any reused stage is changed
+    connections = []
+    for item in json_data:
+        node = item
+        for output in node["outputs"]:
+            if output["connection"]:
+                from_stage_id = node["ID"]
+                to_stage_id = output["connection"]["parentID"]
+                for stage_id in (from_stage_id, to_stage_id):
+                    if stage_id not in pipeline.stages:
+                        raise KeyError(stage_id)
+                connections.append((from_stage_id, output["port"], to_stage_id, output["connection"]["port"]))
+
+    for stage_id, options in reused.items():
+        stage = pipeline.stages[stage_id]
+        stage.configure(options)
+        stage.inputs = {}
+        stage.outputs = {}
+
+    for from_stage_id, from_port, to_stage_id, to_port in connections:
+        pipeline.connect_stages(
+            from_stage_id=from_stage_id,
+            from_port=from_port,
+            to_stage_id=to_stage_id,
+            to_port=to_port
+        )
+
+    # Stages that were not carried over to the new pipeline free their resources
+    for stage_id, stage in previous.items():
+        if pipeline.stages.get(stage_id) is not stage:
+            stage.release()
+
+    return pipeline
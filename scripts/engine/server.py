@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from threading import Lock, Thread
+
+import uvicorn
+from fastapi import FastAPI, WebSocket
+from fastapi.responses import FileResponse
+from pydantic import BaseModel
+
+import engine
+from engine.config import STATIC_DIR
+
+CANVAS_PATH = f"{STATIC_DIR}/canvas.json"
+OUTPUT_PATH = f"{STATIC_DIR}/output.png"
+
+# Pipeline kept between requests so its stages reuse their prepared resources
+pipeline = None
+pipeline_lock = Lock()
+
+# Define a Pydantic model for the data you expect to receive
+class DataModel(BaseModel):
+    canvas: list
+
+def warm_up():
+    global pipeline
+    # Build the last saved canvas and warm it up; requests wait on the lock until it is done
+    with pipeline_lock:
+        if not os.path.exists(CANVAS_PATH):
+            return
+        with open(CANVAS_PATH, "r") as f:
+            pipeline = engine.setup_pipeline_from_json(json.loads(f.read()))
+        if "Output-1" in pipeline.stages:
+            pipeline.warm_up()
+
+@asynccontextmanager
+async def lifespan(app):
+    # Warm up off the startup path so the server accepts connections immediately
+    Thread(target=warm_up, daemon=True).start()
+    yield
+
+# Initialize FastAPI app
+app = FastAPI(lifespan=lifespan)
+
+# Endpoint to handle POST requests
+@app.post("/api/save_data")
+def save_data(item: DataModel):
+    global pipeline
+    print("HIT /save_data !")
+    # The canvas file is only written once the graph has been accepted, and under
+    # the lock, so it always matches the live pipeline
+    with pipeline_lock:
+        t1_s = time.time()
+        pipeline = engine.setup_pipeline_from_json(item.canvas, pipeline)
+        t1_e = time.time()
+
+        with open(CANVAS_PATH, "w") as file:
+            json.dump(item.canvas, file)
+
+        t2_s = time.time()
+        pipeline.run()
+        t2_e = time.time()
+
+    print(f"T1: {t1_e - t1_s}\nT2: {t2_e - t2_s}\n")
+
+    return {"message": "Data saved successfully"}
+
+# Endpoint to serve the image
+@app.get("/api/image")
+async def get_image():
+    return FileResponse(OUTPUT_PATH)
+
+# WebSocket endpoint to notify client to refresh the image
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    await websocket.accept()
+    try:
+        while True:
+            await websocket.send_text("update")
+            await asyncio.sleep(0.1)  # Update every 100 milliseconds
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        await websocket.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless pipeline API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8007)
+    args = parser.parse_args()
+
+    # Ensure the directory exists
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
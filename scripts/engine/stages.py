@@ -0,0 +1,225 @@
+import cv2
+import numpy as np
+
+from engine.config import STATIC_DIR
+
+
+INPUT_SIZE = (int(6048 / 4), int(4024 / 4))
+
+STAGE_REGISTRY = {}
+
+def register_stage(stage_name):
+    def decorator(stage_class):
+        STAGE_REGISTRY[stage_name] = stage_class
+        return stage_class
+    return decorator
+
+
+class Stage:
+    # Ports whose upstream results are passed to process(), in order
+    input_ports = (1,)
+
+    def __init__(self, stage_name, ID, options):
+        self.stage_name = stage_name
+        self.ID = ID
+        self.options = None
+        self.inputs = {}
+        self.outputs = {}
+        self.prepared = False
+        self.write_images = True
+        self.configure(options)
+
+    def add_input(self, stage, port):
+        self.inputs[port] = stage
+
+    def add_output(self, stage, port):
+        self.outputs[port] = stage
+
+    def configure(self, options):
+        # Resources are only rebuilt when the options actually change
+        if options == self.options:
+            return
+        self.release()
+        self.options = options
+
+    def prepare(self):
+        pass
+
+    def process(self, *images):
+        raise NotImplementedError("Each stage must implement the process method.")
+
+    def release(self):
+        self.prepared = False
+
+    def run(self, data=None):
+        images = [self.inputs[port].run(data) for port in self.input_ports]
+        if not self.prepared:
+            self.prepare()
+            self.prepared = True
+        return self.process(*images)
+
+    def save(self, path, image):
+        if not self.write_images:
+            return False
+        cv2.imwrite(path, image)
+        return True
+
+
+@register_stage("Input")
+class Input(Stage):
+    input_ports = ()
+
+    def run(self, data=None):
+        print("Input")
+        # A frame passed in by the caller (e.g. warm-up) replaces the file on disk
+        if data is not None:
+            return data.copy()
+
+        # Load the image from disk (use a placeholder image path for now)
+        image_path = f'{STATIC_DIR}/leaf.png'
+        image = cv2.imread(image_path)
+
+        if image is None:
+            print(f"Error: Could not load image from {image_path}")
+            exit()
+
+        image = cv2.resize(image, INPUT_SIZE)
+        return image
+
+@register_stage("Output")
+class Output(Stage):
+    def process(self, image):
+        print("Output")
+        # Save the resulting image
+        output_path = f'{STATIC_DIR}/output.png'
+        if self.save(output_path, image):
+            print(f"Processed image saved at {output_path}")
+        return image
+
+@register_stage("Contours-Circle")
+class Contours_Circle(Stage):
+    def prepare(self):
+        self.min_radius = self.options.get('min_radius', 0)
+
+    def process(self, image):
+        print("EDGE")
+        # Find contours
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        # Create a mask with circles
+        mask = np.zeros_like(gray)
+
+        for contour in contours:
+            (x, y), radius = cv2.minEnclosingCircle(contour)
+            radius = int(radius)
+            if radius > self.min_radius:
+                cv2.circle(mask, (int(x), int(y)), radius, (255), -1)
+                cv2.circle(image, (int(x), int(y)), radius, (255, 0, 255), 2)
+
+        self.save(f"{STATIC_DIR}/{self.ID}-mask.png", mask)
+        self.save(f"{STATIC_DIR}/{self.ID}-image.png", image)
+        return mask
+
+
+@register_stage("Contours-ConvexHull")
+class Contours_ConvexHull(Stage):
+    def prepare(self):
+        self.min_area = self.options.get('min_area', 0)
+
+    def process(self, image):
+        print("EDGE")
+        # Find contours
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        # Create a mask with circles
+        mask = np.zeros_like(gray)
+
+        hulls = []
+        for contour in contours:
+            if cv2.contourArea(contour) > self.min_area:
+                hull = cv2.convexHull(contour)
+                hulls.append(hull)
+
+        cv2.drawContours(image, hulls, -1, (0, 0, 255), 2)
+        cv2.drawContours(mask, hulls, -1, (255, 255, 255), -1)
+
+        self.save(f"{STATIC_DIR}/{self.ID}-mask.png", mask)
+        self.save(f"{STATIC_DIR}/{self.ID}-image.png", image)
+        return mask
+
+
+@register_stage("Bitwise AND")
+class BitwiseAND(Stage):
+    input_ports = (2, 1)
+
+    def process(self, image, mask):
+        print("AND")
+        result = cv2.bitwise_and(image, image, mask=mask)
+        self.save(f"{STATIC_DIR}/{self.ID}.png", result)
+        return result
+
+@register_stage("Threshold")
+class HSVThreshold(Stage):
+    def prepare(self):
+        self.lower_bound = (self.options.get('min_h', 0), self.options.get('min_s', 0), self.options.get('min_v', 0))
+        self.upper_bound = (self.options.get('max_h', 180), self.options.get('max_s', 255), self.options.get('max_v', 255))
+
+    def process(self, image):
+        print("HSV")
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv, self.lower_bound, self.upper_bound)
+        result = cv2.bitwise_and(image, image, mask=mask)
+        self.save(f"{STATIC_DIR}/{self.ID}.png", result)
+        return result
+
+@register_stage("Blur")
+class Blur(Stage):
+    def prepare(self):
+        bk = self.options.get('kernel_size', 35)
+        if bk % 2 == 0:
+            bk += 1
+        self.ksize = (bk, bk)
+
+    def process(self, image):
+        print("Blur")
+        result = cv2.GaussianBlur(image, self.ksize, 0)
+        self.save(f"{STATIC_DIR}/{self.ID}.png", result)
+        return result
+
+@register_stage("Dilate")
+class Dilate(Stage):
+    def prepare(self):
+        dk = self.options.get('kernel_size', 1)
+        if dk % 2 == 0:
+            dk += 1
+        self.kernel = np.ones((dk, dk), np.uint8)
+        self.iterations = self.options.get('iterations', 1)
+
+    def process(self, img):
+        print("Dilate")
+        result = cv2.dilate(img, self.kernel, iterations=self.iterations)
+        self.save(f"{STATIC_DIR}/{self.ID}.png", result)
+        return result
+
+@register_stage("CLAHE")
+class Clahe(Stage):
+    def prepare(self):
+        cl = self.options.get('clip_limit', 1)
+        tgs = self.options.get('tile_grid_size', 1)
+        self.clahe = cv2.createCLAHE(clipLimit=float(cl), tileGridSize=(tgs, tgs))
+
+    def release(self):
+        self.clahe = None
+        super().release()
+
+    def process(self, img):
+        print("CLAHE")
+        lab_img = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
+        l, a, b = cv2.split(lab_img)
+        l_clahe = self.clahe.apply(l)
+        lab_clahe_img = cv2.merge((l_clahe, a, b))
+        result = cv2.cvtColor(lab_clahe_img, cv2.COLOR_LAB2BGR)
+        self.save(f"{STATIC_DIR}/{self.ID}.png", result)
+        return result